@@ -0,0 +1,57 @@
+"""store completed nodes on graph state snapshots
+
+Revision ID: 20260223_0006
+Revises: 20260222_0005
+Create Date: 2026-02-23 09:10:00
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20260223_0006"
+down_revision = "20260222_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "graph_state_snapshots",
+        sa.Column(
+            "completed_nodes",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default=sa.text("'[]'::jsonb"),
+            nullable=False,
+        ),
+    )
+    # Existing snapshots get the nodes whose result field is set in their stored state,
+    # in flow order.
+    op.execute(
+        """
+        UPDATE graph_state_snapshots AS s
+        SET completed_nodes = COALESCE(
+            (
+                SELECT jsonb_agg(n.node ORDER BY n.position)
+                FROM (
+                    VALUES
+                        ('log_summarizer', 'log_summarizer_result', 1),
+                        ('threat_classifier', 'threat_classifier_result', 2),
+                        ('incident_reporter', 'incident_reporter_result', 3)
+                ) AS n(node, state_field, position)
+                WHERE jsonb_typeof(s.graph_state -> n.state_field) <> 'null'
+            ),
+            '[]'::jsonb
+        )
+        FROM tasks AS t
+        WHERE t.id = s.task_id AND t.flow_name = 'soc_pipeline'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("graph_state_snapshots", "completed_nodes")
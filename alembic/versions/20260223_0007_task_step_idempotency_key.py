@@ -0,0 +1,34 @@
+"""store the tool call idempotency key on task steps
+
+Revision ID: 20260223_0007
+Revises: 20260223_0006
+Create Date: 2026-02-23 10:30:00
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20260223_0007"
+down_revision = "20260223_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "task_steps",
+        sa.Column("idempotency_key", sa.String(length=255), nullable=True),
+    )
+    op.execute(
+        "UPDATE task_steps "
+        "SET idempotency_key = task_id::text || ':' || id::text || ':' || step_name"
+    )
+    op.alter_column("task_steps", "idempotency_key", nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column("task_steps", "idempotency_key")
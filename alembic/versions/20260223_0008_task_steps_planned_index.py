@@ -0,0 +1,31 @@
+"""add partial index on planned task steps
+
+Revision ID: 20260223_0008
+Revises: 20260223_0007
+Create Date: 2026-02-23 11:45:00
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20260223_0008"
+down_revision = "20260223_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_task_steps_planned",
+        "task_steps",
+        ["task_id", "step_index"],
+        postgresql_where=sa.text("status = 'PLANNED'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_steps_planned", table_name="task_steps")
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from uuid import UUID
 
-from fastapi import Depends, FastAPI, HTTPException, Response, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from taskrunner.db import get_db
@@ -17,13 +19,21 @@ from taskrunner.service import (
     TaskNotFoundError,
     TaskRunnerService,
 )
+from taskrunner.tools import close_cdrmind_clients
 from taskrunner.tracing import configure_tracing
 
 configure_logging()
 configure_tracing(service_name="taskrunner-api")
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Task Runner", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    yield
+    close_cdrmind_clients()
+
+
+app = FastAPI(title="Task Runner", version="0.1.0", lifespan=lifespan)
 
 
 @app.get("/health")
@@ -97,9 +107,13 @@ def run_task(
 
 
 @app.get("/tasks", response_model=list[TaskResponse])
-def list_tasks(db: Session = Depends(get_db)) -> list[TaskResponse]:
+def list_tasks(
+    limit: int | None = Query(default=None, ge=1),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+) -> list[TaskResponse]:
     service = TaskRunnerService(db)
-    tasks = service.list_tasks()
+    tasks = service.list_tasks(limit=limit, offset=offset)
     logger.info("list_tasks.succeeded", extra={"count": len(tasks)})
     return [TaskResponse.model_validate(task) for task in tasks]
 
@@ -249,7 +249,7 @@ def run_local_command(args: argparse.Namespace) -> int:
             return 2
         task = service.create_task(request)
         try:
-            task = service.run_task(task.id, max_steps=args.max_steps)
+            task = service.run_task_fast(task.id, max_steps=args.max_steps)
         except PolicyViolationError as exc:
             print(f"Policy violation [{exc.code}]: {exc.message}")
             return 2
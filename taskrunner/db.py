@@ -1,14 +1,32 @@
 from __future__ import annotations
 
 from collections.abc import Generator
+from typing import Any
 
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from taskrunner.config import get_database_url
 
-engine = create_engine(get_database_url(), future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+def _json_dumps(value: Any) -> bytes:
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+engine = create_engine(
+    get_database_url(),
+    future=True,
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
+)
+SessionLocal = sessionmaker(
+    bind=engine,
+    autoflush=False,
+    autocommit=False,
+    expire_on_commit=False,
+    future=True,
+)
 
 
 def get_db() -> Generator[Session, None, None]:
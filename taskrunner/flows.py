@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from typing import Any, TypedDict, cast
 
 from langgraph.graph import END, START, StateGraph
@@ -31,17 +32,32 @@ class FlowDefinition:
     node_sequence: tuple[str, ...]
     node_handlers: dict[str, Any]
     graph: Any
+    _next_nodes: dict[str, str | None] = field(init=False, repr=False, compare=False)
+    _result_fields: tuple[tuple[str, str], ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        next_nodes: dict[str, str | None] = {}
+        for idx, node_name in enumerate(self.node_sequence):
+            following = self.node_sequence[idx + 1 : idx + 2]
+            next_nodes.setdefault(node_name, following[0] if following else None)
+        object.__setattr__(self, "_next_nodes", next_nodes)
 
     def first_node(self) -> str | None:
         return self.node_sequence[0] if self.node_sequence else None
 
     def next_node(self, current_node: str) -> str | None:
-        if current_node not in self.node_sequence:
-            return None
-        idx = self.node_sequence.index(current_node)
-        if idx + 1 >= len(self.node_sequence):
-            return None
-        return self.node_sequence[idx + 1]
+        return self._next_nodes.get(current_node)
+
+    def result_fields(self) -> tuple[tuple[str, str], ...]:
+        result_fields = self._result_fields
+        if result_fields is None:
+            result_fields = tuple(
+                (node_name, get_node_result_field(node_name)) for node_name in self.node_sequence
+            )
+            object.__setattr__(self, "_result_fields", result_fields)
+        return result_fields
 
 
 def _summarize_node(state: GraphExecutionState) -> dict[str, Any]:
@@ -149,17 +165,35 @@ def build_initial_graph_state(request: TaskCreateRequest) -> GraphExecutionState
     return state
 
 
+def _build_soc_agent_input_payload(request: TaskCreateRequest) -> dict[str, Any]:
+    return {
+        "raw_logs": request.raw_logs or [],
+        "session_id": request.session_id or "",
+        "context": {
+            "actor_id": request.actor_id or "",
+            "actor_role": request.actor_role or "",
+        },
+    }
+
+
+StepInputBuilder = Callable[[TaskCreateRequest], dict[str, Any]]
+
+_STEP_INPUT_BUILDERS: dict[str, StepInputBuilder] = {
+    "log_summarizer": _build_soc_agent_input_payload,
+    "threat_classifier": _build_soc_agent_input_payload,
+    "incident_reporter": _build_soc_agent_input_payload,
+}
+
+
+def get_step_input_builder(node_name: str) -> StepInputBuilder:
+    try:
+        return _STEP_INPUT_BUILDERS[node_name]
+    except KeyError as exc:
+        raise ValueError(f"Unsupported node '{node_name}'") from exc
+
+
 def build_step_input_payload(request: TaskCreateRequest, node_name: str) -> dict[str, Any]:
-    if node_name in ("log_summarizer", "threat_classifier", "incident_reporter"):
-        return {
-            "raw_logs": request.raw_logs or [],
-            "session_id": request.session_id or "",
-            "context": {
-                "actor_id": request.actor_id or "",
-                "actor_role": request.actor_role or "",
-            },
-        }
-    raise ValueError(f"Unsupported node '{node_name}'")
+    return get_step_input_builder(node_name)(request)
 
 
 _SOC_RESULT_FIELDS: dict[str, str] = {
@@ -169,6 +203,13 @@ _SOC_RESULT_FIELDS: dict[str, str] = {
 }
 
 
+def get_node_result_field(node_name: str) -> str:
+    try:
+        return _SOC_RESULT_FIELDS[node_name]
+    except KeyError as exc:
+        raise ValueError(f"Unsupported node '{node_name}'") from exc
+
+
 def execute_graph_node(
     *,
     flow_name: str,
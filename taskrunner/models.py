@@ -5,7 +5,18 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy import (
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -30,12 +41,14 @@ class TaskStepStatus(enum.StrEnum):
 
 
 class ToolCallStatus(enum.StrEnum):
+    RUNNING = "RUNNING"
     COMPLETED = "COMPLETED"
     FAILED = "FAILED"
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -91,7 +104,14 @@ class TaskStep(Base):
     __tablename__ = "task_steps"
     __table_args__ = (
         UniqueConstraint("task_id", "step_index", name="uq_task_steps_task_id_step_index"),
+        Index(
+            "ix_task_steps_planned",
+            "task_id",
+            "step_index",
+            postgresql_where=text("status = 'PLANNED'"),
+        ),
     )
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -106,6 +126,7 @@ class TaskStep(Base):
     step_index: Mapped[int] = mapped_column(Integer, nullable=False)
     step_name: Mapped[str] = mapped_column(String(100), nullable=False)
     span_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    idempotency_key: Mapped[str] = mapped_column(String(255), nullable=False)
     status: Mapped[TaskStepStatus] = mapped_column(
         Enum(TaskStepStatus, name="task_step_status", native_enum=False),
         nullable=False,
@@ -199,6 +220,7 @@ class GraphStateSnapshot(Base):
     current_node: Mapped[str | None] = mapped_column(String(100), nullable=True)
     next_node: Mapped[str | None] = mapped_column(String(100), nullable=True)
     graph_state: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False, default=dict)
+    completed_nodes: Mapped[list[str]] = mapped_column(JSONB, nullable=False, default=list)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -1,20 +1,29 @@
 from __future__ import annotations
 
 import logging
+import os
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from json import dumps
 from typing import Any
-from uuid import UUID, uuid4
+from uuid import UUID
 
-from sqlalchemy import select, text
-from sqlalchemy.orm import Session, selectinload
-from tenacity import Retrying, retry_if_not_exception_type, stop_after_attempt, wait_exponential
+from pydantic import BaseModel
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
 
 from taskrunner.flows import (
+    FlowDefinition,
+    StepInputBuilder,
     build_initial_graph_state,
     build_step_input_payload,
     execute_graph_node,
     get_flow_definition,
+    get_step_input_builder,
 )
 from taskrunner.models import (
     AuditLog,
@@ -39,6 +48,41 @@ TOOL_MAX_ATTEMPTS = 3
 TOOL_WAIT_MULTIPLIER_SECONDS = 0.1
 TOOL_WAIT_MIN_SECONDS = 0.1
 TOOL_WAIT_MAX_SECONDS = 1.0
+TASK_LOCK_MAX_ATTEMPTS = 5
+TASK_LOCK_WAIT_BASE_SECONDS = 0.05
+TASK_LOCK_WAIT_MAX_SECONDS = 1.0
+UUID_POOL_SIZE = 256
+
+
+def _completed_nodes(flow_name: str, graph_state: dict[str, Any]) -> list[str]:
+    get = graph_state.get
+    return [
+        node_name
+        for node_name, state_field in get_flow_definition(flow_name).result_fields()
+        if get(state_field) is not None
+    ]
+
+
+def _tool_retry_wait_seconds(attempt: int) -> float:
+    wait = TOOL_WAIT_MULTIPLIER_SECONDS * 2.0 ** (attempt - 1)
+    return min(TOOL_WAIT_MAX_SECONDS, max(TOOL_WAIT_MIN_SECONDS, wait))
+
+
+_uuid_pool: deque[UUID] = deque()
+# A forked worker must not hand out ids its parent already buffered.
+os.register_at_fork(after_in_child=_uuid_pool.clear)
+
+
+def _next_uuid() -> UUID:
+    while True:
+        try:
+            return _uuid_pool.popleft()
+        except IndexError:
+            raw = os.urandom(16 * UUID_POOL_SIZE)
+            _uuid_pool.extend(
+                UUID(bytes=raw[offset : offset + 16], version=4)
+                for offset in range(0, len(raw), 16)
+            )
 
 
 class TaskNotFoundError(Exception):
@@ -53,6 +97,90 @@ class InvalidFlowError(Exception):
     pass
 
 
+class TaskLockedError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class _LockedTask:
+    task: Task
+    next_step: TaskStep | None
+    latest_graph_state: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class _TaskProgress:
+    task: Task
+    has_planned_step: bool
+    latest_completed_nodes: list[str]
+
+
+_GET_TASK_STMT = (
+    select(Task)
+    .options(
+        joinedload(Task.steps).joinedload(TaskStep.tool_calls),
+        selectinload(Task.tool_calls),
+        raiseload("*"),
+    )
+    .where(Task.id == bindparam("task_id"))
+)
+
+_GET_TASK_LITE_STMT = (
+    select(Task)
+    .options(raiseload("*"))
+    .where(Task.id == bindparam("task_id"))
+    .execution_options(populate_existing=True)
+)
+
+_GET_TASK_PROGRESS_STMT = (
+    select(
+        Task,
+        select(TaskStep.id)
+        .where(TaskStep.task_id == Task.id, TaskStep.status == TaskStepStatus.PLANNED)
+        .exists(),
+        select(GraphStateSnapshot.completed_nodes)
+        .where(GraphStateSnapshot.task_id == Task.id)
+        .order_by(GraphStateSnapshot.step_index.desc())
+        .limit(1)
+        .scalar_subquery(),
+    )
+    .options(raiseload("*"))
+    .where(Task.id == bindparam("task_id"))
+    .execution_options(populate_existing=True)
+)
+
+# populate_existing refreshes an already-loaded task from the database, so
+# state kept in the session across commits never overrides another worker.
+_GET_TASK_FOR_ADVANCE_STMT = (
+    select(Task)
+    .options(
+        joinedload(Task.steps).joinedload(TaskStep.tool_calls),
+        selectinload(Task.tool_calls),
+    )
+    .where(Task.id == bindparam("task_id"))
+    .execution_options(populate_existing=True)
+)
+
+_GET_TASK_FOR_UPDATE_STMT = (
+    select(Task)
+    .options(
+        joinedload(Task.steps).joinedload(TaskStep.tool_calls),
+        selectinload(Task.tool_calls),
+    )
+    .where(Task.id == bindparam("task_id"))
+    # Only the task row is locked; children sit on the nullable side of the joins.
+    .with_for_update(of=Task, skip_locked=True)
+    .execution_options(populate_existing=True)
+)
+
+_GET_LATEST_GRAPH_STATE_STMT = (
+    select(GraphStateSnapshot.graph_state)
+    .where(GraphStateSnapshot.task_id == bindparam("task_id"))
+    .order_by(GraphStateSnapshot.step_index.desc())
+    .limit(1)
+)
+
+
 class TaskRunnerService:
     def __init__(self, db: Session) -> None:
         self.db = db
@@ -144,9 +272,10 @@ class TaskRunnerService:
             self.db.commit()
             raise PolicyViolationError("MAX_INPUT_BYTES_EXCEEDED", message)
 
+        validated_inputs: set[tuple[StepInputBuilder, type[BaseModel]]] = set()
         for node_name in flow.node_sequence:
             try:
-                step_payload = build_step_input_payload(request=request, node_name=node_name)
+                build_payload = get_step_input_builder(node_name)
             except ValueError as exc:
                 message = str(exc)
                 self._audit_policy_violation(
@@ -158,17 +287,23 @@ class TaskRunnerService:
                 self.db.commit()
                 raise PolicyViolationError("UNKNOWN_TOOL", message) from exc
             try:
-                get_tool_spec(node_name)
-                validate_tool_input(node_name, step_payload)
+                spec = get_tool_spec(node_name)
+                if (build_payload, spec.input_model) in validated_inputs:
+                    continue
+                validate_tool_input(spec, build_payload(request))
             except PolicyViolationError as exc:
                 self._audit_policy_violation(
                     code=exc.code,
                     message=exc.message,
                     tool_name=node_name,
-                    payload={"flow_name": request.flow_name, "step_payload": step_payload},
+                    payload={
+                        "flow_name": request.flow_name,
+                        "step_payload": build_payload(request),
+                    },
                 )
                 self.db.commit()
                 raise
+            validated_inputs.add((build_payload, spec.input_model))
 
     def create_task(self, request: TaskCreateRequest) -> Task:
         with tracer.start_as_current_span("task.create") as span:
@@ -179,7 +314,7 @@ class TaskRunnerService:
 
             initial_graph_state = dict(build_initial_graph_state(request))
             first_node = flow.first_node()
-            trace_id = format_trace_id(span.get_span_context().trace_id) or str(uuid4())
+            trace_id = format_trace_id(span.get_span_context().trace_id) or str(_next_uuid())
             logger.info(
                 "task.create.started",
                 extra={
@@ -189,7 +324,30 @@ class TaskRunnerService:
                     "actor_id": request.actor_id,
                 },
             )
+            task_id = _next_uuid()
+            initial_completed_nodes = _completed_nodes(flow.name, initial_graph_state)
+            steps = []
+            for index, node_name in enumerate(flow.node_sequence, start=1):
+                step_id = _next_uuid()
+                steps.append(
+                    TaskStep(
+                        id=step_id,
+                        task_id=task_id,
+                        step_index=index,
+                        step_name=node_name,
+                        span_id=str(_next_uuid()),
+                        idempotency_key=self._build_tool_call_idempotency_key(
+                            task_id, step_id, node_name
+                        ),
+                        status=TaskStepStatus.PLANNED,
+                        input_payload=build_step_input_payload(
+                            request=request, node_name=node_name
+                        ),
+                        tool_calls=[],
+                    )
+                )
             task = Task(
+                id=task_id,
                 trace_id=trace_id,
                 status=TaskStatus.PLANNED,
                 flow_name=flow.name,
@@ -200,172 +358,200 @@ class TaskRunnerService:
                     flow_name=flow.name,
                     current_node=first_node,
                     next_node=first_node,
-                    graph_state=initial_graph_state,
+                    completed_nodes=initial_completed_nodes,
                 ),
                 input_payload=request.model_dump(),
                 output_payload=None,
+                steps=steps,
+                tool_calls=[],
             )
-            self.db.add(task)
-            self.db.flush()
-
-            steps = [
-                TaskStep(
-                    task_id=task.id,
-                    step_index=index,
-                    step_name=node_name,
-                    span_id=str(uuid4()),
-                    status=TaskStepStatus.PLANNED,
-                    input_payload=build_step_input_payload(request=request, node_name=node_name),
-                )
-                for index, node_name in enumerate(flow.node_sequence, start=1)
-            ]
-            self.db.add_all(steps)
-            self._upsert_graph_snapshot(
-                task_id=task.id,
+            snapshot = GraphStateSnapshot(
+                task_id=task_id,
                 step_index=0,
-                current_node=task.current_node,
-                next_node=task.next_node,
+                current_node=first_node,
+                next_node=first_node,
                 graph_state=initial_graph_state,
+                completed_nodes=initial_completed_nodes,
             )
+            self.db.add_all([task, *steps, snapshot])
             self.db.commit()
             logger.info(
                 "task.create.succeeded",
-                extra={"task_id": str(task.id), "trace_id": task.trace_id},
+                extra={"task_id": str(task_id), "trace_id": trace_id},
             )
-            return self.get_task(task.id)
+            return task
 
     def advance_task(self, task_id: UUID) -> Task:
         try:
-            self._acquire_task_lock(task_id)
-            task = self._get_task_for_update(task_id)
-            with tracer.start_as_current_span(
-                "task.advance",
-                attributes={
-                    "task.id": str(task.id),
-                    "task.trace_id": task.trace_id,
-                    "task.status": task.status.value,
-                },
-            ):
-                logger.info(
-                    "task.advance.started",
-                    extra={
-                        "task_id": str(task.id),
-                        "status": task.status.value,
-                        "trace_id": task.trace_id,
-                    },
-                )
+            try:
+                task = self._advance_task_in_transaction(task_id)
+            except TaskLockedError:
+                # Another worker is advancing this task; hand back its current state.
+                self.db.rollback()
+                logger.warning("task.advance.locked", extra={"task_id": str(task_id)})
+                return self.get_task(task_id)
+            self.db.commit()
+            return task
+        except Exception:
+            self.db.rollback()
+            raise
 
-                if task.status in TERMINAL_TASK_STATUSES:
-                    logger.info(
-                        "task.advance.terminal",
-                        extra={
-                            "task_id": str(task.id),
-                            "status": task.status.value,
-                            "trace_id": task.trace_id,
-                        },
-                    )
-                    self.db.commit()
-                    return self.get_task(task.id)
+    def _advance_task_in_transaction(self, task_id: UUID) -> Task:
+        progress = self._get_task_progress(task_id)
+        task = progress.task
+        task_id_str = str(task.id)
+        with tracer.start_as_current_span(
+            "task.advance",
+            attributes={
+                "task.id": task_id_str,
+                "task.trace_id": task.trace_id,
+                "task.status": task.status.value,
+            },
+        ):
+            logger.info(
+                "task.advance.started",
+                extra={
+                    "task_id": task_id_str,
+                    "status": task.status.value,
+                    "trace_id": task.trace_id,
+                },
+            )
 
-                if task.status == TaskStatus.PLANNED:
-                    task.status = TaskStatus.RUNNING
-                    task.current_node = task.next_node
+            log_level = logging.INFO
+            log_event = "task.advance.transition"
+            log_fields: dict[str, Any] = {}
+            if task.status in TERMINAL_TASK_STATUSES:
+                task = self._get_task_for_advance(task_id)
+                log_event = "task.advance.terminal"
+                log_fields["status"] = task.status.value
+            elif task.status == TaskStatus.RUNNING:
+                locked = self._get_task_for_update(task_id)
+                task = locked.task
+                if task.status != TaskStatus.RUNNING:
+                    return task
+                next_step = locked.next_step
+                if next_step is not None:
+                    self._execute_step(task, next_step, locked.latest_graph_state)
+                    log_event = "task.advance.executed"
+                    log_fields["step"] = next_step.step_name
+                else:
+                    task.status = TaskStatus.FAILED
+                    task.next_node = None
                     task.graph_state_summary = self._build_graph_state_summary(
                         flow_name=task.flow_name,
                         current_node=task.current_node,
                         next_node=task.next_node,
-                        graph_state=self._get_latest_graph_state(task.id),
-                    )
-                    logger.info(
-                        "task.advance.transition",
-                        extra={
-                            "task_id": str(task.id),
-                            "to": task.status.value,
-                            "trace_id": task.trace_id,
-                        },
-                    )
-                    self.db.commit()
-                    return self.get_task(task.id)
-
-                if task.status == TaskStatus.RUNNING:
-                    next_step = self._get_next_planned_step(task.id)
-                    if next_step is None:
-                        task.status = TaskStatus.FAILED
-                        task.next_node = None
-                        task.graph_state_summary = self._build_graph_state_summary(
-                            flow_name=task.flow_name,
-                            current_node=task.current_node,
-                            next_node=task.next_node,
-                            graph_state=self._get_latest_graph_state(task.id),
-                        )
-                        logger.error(
-                            "task.advance.no_step",
-                            extra={"task_id": str(task.id), "trace_id": task.trace_id},
-                        )
-                        self.db.commit()
-                        return self.get_task(task.id)
-
-                    self._execute_step(task, next_step)
-                    logger.info(
-                        "task.advance.executed",
-                        extra={
-                            "task_id": str(task.id),
-                            "step": next_step.step_name,
-                            "trace_id": task.trace_id,
-                        },
+                        completed_nodes=self._get_latest_completed_nodes(task.id),
                     )
-                    self.db.commit()
-                    return self.get_task(task.id)
-
-                if task.status == TaskStatus.WAITING_OBSERVATION:
-                    if self._get_next_planned_step(task.id) is None:
-                        task.status = TaskStatus.COMPLETED
-                        task.next_node = None
-                        task.output_payload = self._build_output_payload(task.id)
+                    log_level = logging.ERROR
+                    log_event = "task.advance.no_step"
+            else:
+                expected_status = task.status
+                values: dict[str, Any] = {}
+                if task.status == TaskStatus.PLANNED:
+                    values = {"status": TaskStatus.RUNNING, "current_node": task.next_node}
+                    log_fields["to"] = TaskStatus.RUNNING.value
+                elif task.status == TaskStatus.WAITING_OBSERVATION:
+                    if not progress.has_planned_step:
+                        values = {
+                            "status": TaskStatus.COMPLETED,
+                            "next_node": None,
+                            "output_payload": self._build_output_payload(task.id),
+                        }
                     else:
-                        task.status = TaskStatus.RUNNING
-                        task.current_node = task.next_node
-                    task.graph_state_summary = self._build_graph_state_summary(
-                        flow_name=task.flow_name,
-                        current_node=task.current_node,
-                        next_node=task.next_node,
-                        graph_state=self._get_latest_graph_state(task.id),
-                    )
-                    logger.info(
-                        "task.advance.transition",
-                        extra={
-                            "task_id": str(task.id),
-                            "to": task.status.value,
-                            "trace_id": task.trace_id,
-                        },
-                    )
-                    self.db.commit()
-                    return self.get_task(task.id)
+                        values = {"status": TaskStatus.RUNNING, "current_node": task.next_node}
+                    log_fields["to"] = values["status"].value
+                else:
+                    log_fields["status"] = task.status.value
+                    values = {"status": TaskStatus.FAILED, "next_node": None}
+                    log_level = logging.ERROR
+                    log_event = "task.advance.invalid_state"
 
-                previous_status = task.status.value
-                task.status = TaskStatus.FAILED
-                task.next_node = None
-                task.graph_state_summary = self._build_graph_state_summary(
+                graph_state_summary = self._build_graph_state_summary(
                     flow_name=task.flow_name,
-                    current_node=task.current_node,
-                    next_node=task.next_node,
-                    graph_state=self._get_latest_graph_state(task.id),
+                    current_node=values.get("current_node", task.current_node),
+                    next_node=values.get("next_node", task.next_node),
+                    completed_nodes=progress.latest_completed_nodes,
                 )
-                logger.error(
-                    "task.advance.invalid_state",
-                    extra={
-                        "task_id": str(task.id),
-                        "status": previous_status,
-                        "trace_id": task.trace_id,
-                    },
+                if graph_state_summary != task.graph_state_summary:
+                    values["graph_state_summary"] = graph_state_summary
+                # Compare-and-set on the status the decision was based on, instead of
+                # holding a row lock across the read-compute-write cycle.
+                updated_id = self.db.scalar(
+                    update(Task)
+                    .where(Task.id == task.id, Task.status == expected_status)
+                    .values(**values)
+                    .returning(Task.id)
                 )
-                self.db.commit()
-                return self.get_task(task.id)
+                if updated_id is None:
+                    log_level = logging.WARNING
+                    log_event = "task.advance.conflict"
+                    log_fields = {"status": expected_status.value}
+                task = self._get_task_for_advance(task_id)
+            logger.log(
+                log_level,
+                log_event,
+                extra={"task_id": task_id_str, **log_fields, "trace_id": task.trace_id},
+            )
+        return task
+
+    def run_task(self, task_id: UUID, max_steps: int) -> Task:
+        self._check_max_steps(task_id, max_steps)
+        task = self._get_task_lite(task_id)
+        if task.status in TERMINAL_TASK_STATUSES:
+            return self.get_task(task_id)
+        for _ in range(max_steps):
+            if task.status in TERMINAL_TASK_STATUSES:
+                return task
+            task = self.advance_task(task_id)
+
+        if task.status in TERMINAL_TASK_STATUSES:
+            return task
+        raise MaxStepsExceededError(
+            f"Task {task_id} did not reach terminal state within {max_steps} steps"
+        )
+
+    def run_task_fast(self, task_id: UUID, max_steps: int) -> Task:
+        # Advances every step in one transaction and commits once, so intermediate
+        # states are never visible to other connections.
+        self._check_max_steps(task_id, max_steps)
+        task = self._get_task_lite(task_id)
+        if task.status in TERMINAL_TASK_STATUSES:
+            return self.get_task(task_id)
+        try:
+            for _ in range(max_steps):
+                try:
+                    # A SAVEPOINT per advance undoes only the failing step; releasing it
+                    # also flushes, so the next advance reads this one's writes.
+                    with self.db.begin_nested():
+                        task = self._advance_task_in_transaction(task_id)
+                except TaskLockedError:
+                    self._commit_run_progress(task_id)
+                    logger.warning("task.advance.locked", extra={"task_id": str(task_id)})
+                    return self.get_task(task_id)
+                if task.status in TERMINAL_TASK_STATUSES:
+                    break
         except Exception:
-            self.db.rollback()
+            self._commit_run_progress(task_id)
             raise
+        self.db.commit()
 
-    def run_task(self, task_id: UUID, max_steps: int) -> Task:
+        if task.status in TERMINAL_TASK_STATUSES:
+            return task
+        raise MaxStepsExceededError(
+            f"Task {task_id} did not reach terminal state within {max_steps} steps"
+        )
+
+    def _commit_run_progress(self, task_id: UUID) -> None:
+        # Keeps the steps advanced before an interruption, as run_task does; a failed
+        # commit is logged so it never replaces the exception being handled.
+        try:
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            logger.exception("task.run.commit_failed", extra={"task_id": str(task_id)})
+
+    def _check_max_steps(self, task_id: UUID, max_steps: int) -> None:
         if max_steps < 1:
             raise ValueError("max_steps must be >= 1")
         limits = get_policy_limits()
@@ -380,69 +566,103 @@ class TaskRunnerService:
             self.db.commit()
             raise PolicyViolationError("MAX_STEPS_EXCEEDED", message)
 
-        task = self.get_task(task_id)
-        for _ in range(max_steps):
-            if task.status in TERMINAL_TASK_STATUSES:
-                return task
-            task = self.advance_task(task_id)
+    def get_task(self, task_id: UUID) -> Task:
+        task = self.db.execute(_GET_TASK_STMT, {"task_id": task_id}).unique().scalar_one_or_none()
+        if task is None:
+            logger.warning("task.not_found", extra={"task_id": str(task_id)})
+            raise TaskNotFoundError(f"Task {task_id} not found")
+        return task
 
-        if task.status in TERMINAL_TASK_STATUSES:
-            return task
-        raise MaxStepsExceededError(
-            f"Task {task_id} did not reach terminal state within {max_steps} steps"
-        )
+    def _get_task_lite(self, task_id: UUID) -> Task:
+        task = self.db.scalar(_GET_TASK_LITE_STMT, {"task_id": task_id})
+        if task is None:
+            logger.warning("task.not_found", extra={"task_id": str(task_id)})
+            raise TaskNotFoundError(f"Task {task_id} not found")
+        return task
 
-    def get_task(self, task_id: UUID) -> Task:
+    def list_tasks(self, limit: int | None = None, offset: int = 0) -> list[Task]:
         stmt = (
             select(Task)
             .options(
                 selectinload(Task.steps).selectinload(TaskStep.tool_calls),
                 selectinload(Task.tool_calls),
+                raiseload("*"),
             )
-            .where(Task.id == task_id)
+            # The id tie-break keeps pages stable when tasks share a creation time.
+            .order_by(Task.created_at.desc(), Task.id.desc())
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        if offset:
+            stmt = stmt.offset(offset)
+        return list(self.db.scalars(stmt).all())
+
+    def _get_task_progress(self, task_id: UUID) -> _TaskProgress:
+        row = self.db.execute(_GET_TASK_PROGRESS_STMT, {"task_id": task_id}).one_or_none()
+        if row is None:
+            logger.warning("task.not_found", extra={"task_id": str(task_id)})
+            raise TaskNotFoundError(f"Task {task_id} not found")
+        task, planned, completed_nodes = row
+        return _TaskProgress(
+            task=task,
+            has_planned_step=planned,
+            latest_completed_nodes=completed_nodes or [],
+        )
+
+    def _get_task_for_advance(self, task_id: UUID) -> Task:
+        task = (
+            self.db.execute(_GET_TASK_FOR_ADVANCE_STMT, {"task_id": task_id})
+            .unique()
+            .scalar_one_or_none()
         )
-        task = self.db.scalar(stmt)
         if task is None:
             logger.warning("task.not_found", extra={"task_id": str(task_id)})
             raise TaskNotFoundError(f"Task {task_id} not found")
         return task
 
-    def list_tasks(self) -> list[Task]:
+    def _get_task_for_update(self, task_id: UUID) -> _LockedTask:
+        # SKIP LOCKED lets us poll with backoff instead of parking the connection on a
+        # row another worker holds.
+        for attempt in range(TASK_LOCK_MAX_ATTEMPTS):
+            task = (
+                self.db.execute(_GET_TASK_FOR_UPDATE_STMT, {"task_id": task_id})
+                .unique()
+                .scalar_one_or_none()
+            )
+            if task is not None:
+                break
+            if attempt + 1 < TASK_LOCK_MAX_ATTEMPTS:
+                delay = min(TASK_LOCK_WAIT_MAX_SECONDS, TASK_LOCK_WAIT_BASE_SECONDS * 2**attempt)
+                time.sleep(delay + random.random() * TASK_LOCK_WAIT_BASE_SECONDS)
+        else:
+            raise TaskLockedError(
+                f"Task {task_id} is locked by another worker "
+                f"after {TASK_LOCK_MAX_ATTEMPTS} attempts"
+            )
+        graph_state = self.db.scalar(_GET_LATEST_GRAPH_STATE_STMT, {"task_id": task_id})
+        next_step = next(
+            (step for step in task.steps if step.status == TaskStepStatus.PLANNED),
+            None,
+        )
+        return _LockedTask(task=task, next_step=next_step, latest_graph_state=graph_state or {})
+
+    def claim_next_task(self) -> Task | None:
+        # SKIP LOCKED lets polling workers claim distinct tasks without queueing on each
+        # other; the row lock is held until the caller commits or rolls back.
         stmt = (
             select(Task)
             .options(
                 selectinload(Task.steps).selectinload(TaskStep.tool_calls),
                 selectinload(Task.tool_calls),
             )
-            .order_by(Task.created_at.desc())
-        )
-        return list(self.db.scalars(stmt).all())
-
-    def _get_next_planned_step(self, task_id: UUID) -> TaskStep | None:
-        stmt = (
-            select(TaskStep)
-            .where(
-                TaskStep.task_id == task_id,
-                TaskStep.status == TaskStepStatus.PLANNED,
-            )
-            .order_by(TaskStep.step_index.asc())
+            .where(Task.status.in_((TaskStatus.PLANNED, TaskStatus.RUNNING)))
+            .order_by(Task.created_at.asc())
             .limit(1)
+            .with_for_update(skip_locked=True, of=Task)
+            .execution_options(populate_existing=True)
         )
         return self.db.scalar(stmt)
 
-    def _get_task_for_update(self, task_id: UUID) -> Task:
-        stmt = select(Task).where(Task.id == task_id).with_for_update()
-        task = self.db.scalar(stmt)
-        if task is None:
-            logger.warning("task.not_found", extra={"task_id": str(task_id)})
-            raise TaskNotFoundError(f"Task {task_id} not found")
-        return task
-
-    def _acquire_task_lock(self, task_id: UUID) -> None:
-        # Advisory lock key must fit signed bigint.
-        lock_key = task_id.int % ((2**63) - 1)
-        self.db.execute(text("SELECT pg_advisory_xact_lock(:lock_key)"), {"lock_key": lock_key})
-
     def _build_tool_call_idempotency_key(self, task_id: UUID, step_id: UUID, tool_name: str) -> str:
         return f"{task_id}:{step_id}:{tool_name}"
 
@@ -455,52 +675,49 @@ class TaskRunnerService:
         node_name: str,
         graph_state: dict[str, Any],
     ) -> tuple[dict[str, Any] | None, dict[str, Any] | None, str | None, int, datetime, datetime]:
-        started_at = datetime.now(UTC)
-        attempts = 0
+        started = time.time()
         last_error: str | None = None
-        try:
-            for attempt in Retrying(
-                stop=stop_after_attempt(TOOL_MAX_ATTEMPTS),
-                wait=wait_exponential(
-                    multiplier=TOOL_WAIT_MULTIPLIER_SECONDS,
-                    min=TOOL_WAIT_MIN_SECONDS,
-                    max=TOOL_WAIT_MAX_SECONDS,
-                ),
-                retry=retry_if_not_exception_type(PolicyViolationError),
-                reraise=True,
-            ):
-                with attempt:
-                    attempts = attempt.retry_state.attempt_number
-                    output_payload, updated_graph_state = execute_graph_node(
-                        flow_name=flow_name,
-                        node_name=node_name,
-                        graph_state=graph_state,
-                    )
-                    return (
-                        output_payload,
-                        updated_graph_state,
-                        None,
-                        max(0, attempts - 1),
-                        started_at,
-                        datetime.now(UTC),
-                    )
-        except PolicyViolationError:
-            raise
-        except Exception as exc:
-            attempts = max(1, attempts)
-            last_error = str(exc)
-            logger.warning(
-                "tool.execute.failed",
-                extra={
-                    "task_id": str(task_id),
-                    "step_id": str(step_id),
-                    "tool_name": node_name,
-                    "attempts": attempts,
-                    "error": last_error,
-                },
+        for attempt in range(1, TOOL_MAX_ATTEMPTS + 1):
+            try:
+                output_payload, updated_graph_state = execute_graph_node(
+                    flow_name=flow_name,
+                    node_name=node_name,
+                    graph_state=graph_state,
+                )
+            except PolicyViolationError:
+                raise
+            except Exception as exc:
+                last_error = str(exc)
+                if attempt < TOOL_MAX_ATTEMPTS:
+                    time.sleep(_tool_retry_wait_seconds(attempt))
+                continue
+            return (
+                output_payload,
+                updated_graph_state,
+                None,
+                attempt - 1,
+                datetime.fromtimestamp(started, UTC),
+                datetime.fromtimestamp(time.time(), UTC),
             )
-            return None, None, last_error, max(0, attempts - 1), started_at, datetime.now(UTC)
-        raise RuntimeError("unreachable: retry loop exited without returning")
+
+        logger.warning(
+            "tool.execute.failed",
+            extra={
+                "task_id": str(task_id),
+                "step_id": str(step_id),
+                "tool_name": node_name,
+                "attempts": TOOL_MAX_ATTEMPTS,
+                "error": last_error,
+            },
+        )
+        return (
+            None,
+            None,
+            last_error,
+            TOOL_MAX_ATTEMPTS - 1,
+            datetime.fromtimestamp(started, UTC),
+            datetime.fromtimestamp(time.time(), UTC),
+        )
 
     def _fail_step_with_policy_violation(
         self,
@@ -522,7 +739,7 @@ class TaskRunnerService:
             flow_name=task.flow_name,
             current_node=task.current_node,
             next_node=task.next_node,
-            graph_state=self._get_latest_graph_state(task.id),
+            completed_nodes=self._get_latest_completed_nodes(task.id),
         )
         self._audit_policy_violation(
             code=code,
@@ -545,13 +762,102 @@ class TaskRunnerService:
             },
         )
 
-    def _execute_step(self, task: Task, step: TaskStep) -> None:
+    def _insert_tool_call(self, **values: Any) -> ToolCall | None:
+        # None means another worker already recorded a call for this key.
+        stmt = (
+            pg_insert(ToolCall)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[ToolCall.idempotency_key])
+            .returning(ToolCall)
+        )
+        return self.db.scalars(stmt).one_or_none()
+
+    def _reuse_existing_tool_call(
+        self,
+        *,
+        task: Task,
+        step: TaskStep,
+        flow: FlowDefinition,
+        tool_name: str,
+        existing_call: ToolCall,
+    ) -> None:
+        idempotency_key = existing_call.idempotency_key
+        if existing_call.status == ToolCallStatus.COMPLETED:
+            step.status = TaskStepStatus.COMPLETED
+            step.output_payload = existing_call.response_payload
+            step.error_message = None
+            task.current_step = step.step_index
+            task.status = TaskStatus.WAITING_OBSERVATION
+            task.current_node = step.step_name
+            task.next_node = flow.next_node(step.step_name)
+            existing_completed_nodes = self.db.scalar(
+                select(GraphStateSnapshot.completed_nodes)
+                .where(GraphStateSnapshot.task_id == task.id)
+                .order_by(
+                    (GraphStateSnapshot.step_index == step.step_index).desc(),
+                    GraphStateSnapshot.step_index.desc(),
+                )
+                .limit(1)
+            )
+            task.graph_state_summary = self._build_graph_state_summary(
+                flow_name=task.flow_name,
+                current_node=task.current_node,
+                next_node=task.next_node,
+                completed_nodes=existing_completed_nodes or [],
+            )
+        else:
+            existing_error = existing_call.last_error or existing_call.error_message
+            if existing_error is None:
+                existing_error = "Tool call failed"
+            step.status = TaskStepStatus.FAILED
+            step.error_message = existing_error
+            task.status = TaskStatus.FAILED
+            task.current_step = step.step_index
+            task.current_node = step.step_name
+            task.next_node = None
+            task.graph_state_summary = self._build_graph_state_summary(
+                flow_name=task.flow_name,
+                current_node=task.current_node,
+                next_node=task.next_node,
+                completed_nodes=self._get_latest_completed_nodes(task.id),
+            )
+        if logger.isEnabledFor(logging.INFO):
+            task_id_str = str(task.id)
+            step_id_str = str(step.id)
+            logger.info(
+                "tool.execute.idempotent_reuse",
+                extra={
+                    "task_id": task_id_str,
+                    "trace_id": task.trace_id,
+                    "step_id": step_id_str,
+                    "tool_name": tool_name,
+                    "idempotency_key": idempotency_key,
+                    "span_id": existing_call.span_id,
+                    "tool_call_id": str(existing_call.id),
+                },
+            )
+            logger.info(
+                "tool_call.reused",
+                extra={
+                    "task_id": task_id_str,
+                    "trace_id": task.trace_id,
+                    "step_id": step_id_str,
+                    "span_id": existing_call.span_id,
+                    "tool_call_id": str(existing_call.id),
+                    "tool_name": tool_name,
+                    "status": existing_call.status.value,
+                },
+            )
+
+    def _execute_step(self, task: Task, step: TaskStep, latest_graph_state: dict[str, Any]) -> None:
+        task_id_str = str(task.id)
+        step_id_str = str(step.id)
         with tracer.start_as_current_span(
             "task.step.execute",
             attributes={
-                "task.id": str(task.id),
+                "task.id": task_id_str,
                 "task.trace_id": task.trace_id,
-                "step.id": str(step.id),
+                "step.id": step_id_str,
                 "step.name": step.step_name,
                 "step.index": step.step_index,
             },
@@ -562,7 +868,6 @@ class TaskRunnerService:
             tool_name = step.step_name
             request_payload = step.input_payload
             try:
-                get_tool_spec(tool_name)
                 validate_tool_input(tool_name, request_payload)
             except PolicyViolationError as exc:
                 self._fail_step_with_policy_violation(
@@ -576,81 +881,46 @@ class TaskRunnerService:
                 return
 
             flow = get_flow_definition(task.flow_name)
-            idempotency_key = self._build_tool_call_idempotency_key(task.id, step.id, tool_name)
-            existing_call = self.db.scalar(
-                select(ToolCall).where(ToolCall.idempotency_key == idempotency_key).limit(1)
+            idempotency_key = step.idempotency_key
+            existing_call = next(
+                (call for call in step.tool_calls if call.idempotency_key == idempotency_key),
+                None,
             )
             if existing_call is not None:
-                existing_snapshot = self.db.scalar(
-                    select(GraphStateSnapshot)
-                    .where(
-                        GraphStateSnapshot.task_id == task.id,
-                        GraphStateSnapshot.step_index == step.step_index,
-                    )
-                    .limit(1)
-                )
-                if existing_call.status == ToolCallStatus.COMPLETED:
-                    step.status = TaskStepStatus.COMPLETED
-                    step.output_payload = existing_call.response_payload
-                    step.error_message = None
-                    task.current_step = step.step_index
-                    task.status = TaskStatus.WAITING_OBSERVATION
-                    task.current_node = step.step_name
-                    task.next_node = flow.next_node(step.step_name)
-                    summary_graph_state = (
-                        existing_snapshot.graph_state
-                        if existing_snapshot is not None
-                        else self._get_latest_graph_state(task.id)
-                    )
-                    task.graph_state_summary = self._build_graph_state_summary(
-                        flow_name=task.flow_name,
-                        current_node=task.current_node,
-                        next_node=task.next_node,
-                        graph_state=summary_graph_state,
-                    )
-                else:
-                    existing_error = existing_call.last_error or existing_call.error_message
-                    if existing_error is None:
-                        existing_error = "Tool call failed"
-                    step.status = TaskStepStatus.FAILED
-                    step.error_message = existing_error
-                    task.status = TaskStatus.FAILED
-                    task.current_step = step.step_index
-                    task.current_node = step.step_name
-                    task.next_node = None
-                    task.graph_state_summary = self._build_graph_state_summary(
-                        flow_name=task.flow_name,
-                        current_node=task.current_node,
-                        next_node=task.next_node,
-                        graph_state=self._get_latest_graph_state(task.id),
-                    )
-                logger.info(
-                    "tool.execute.idempotent_reuse",
-                    extra={
-                        "task_id": str(task.id),
-                        "trace_id": task.trace_id,
-                        "step_id": str(step.id),
-                        "tool_name": tool_name,
-                        "idempotency_key": idempotency_key,
-                        "span_id": existing_call.span_id,
-                        "tool_call_id": str(existing_call.id),
-                    },
+                self._reuse_existing_tool_call(
+                    task=task,
+                    step=step,
+                    flow=flow,
+                    tool_name=tool_name,
+                    existing_call=existing_call,
                 )
-                logger.info(
-                    "tool_call.reused",
-                    extra={
-                        "task_id": str(task.id),
-                        "trace_id": task.trace_id,
-                        "step_id": str(step.id),
-                        "span_id": existing_call.span_id,
-                        "tool_call_id": str(existing_call.id),
-                        "tool_name": tool_name,
-                        "status": existing_call.status.value,
-                    },
+                return
+            # Reserve the idempotency key before the tool runs; losing the race means
+            # another attempt already recorded this call.
+            tool_call = self._insert_tool_call(
+                id=_next_uuid(),
+                task_id=task.id,
+                task_step_id=step.id,
+                span_id=step.span_id,
+                idempotency_key=idempotency_key,
+                tool_name=tool_name,
+                status=ToolCallStatus.RUNNING,
+                request_payload=request_payload,
+            )
+            if tool_call is None:
+                self._reuse_existing_tool_call(
+                    task=task,
+                    step=step,
+                    flow=flow,
+                    tool_name=tool_name,
+                    existing_call=self.db.scalars(
+                        select(ToolCall).where(ToolCall.idempotency_key == idempotency_key)
+                    ).one(),
                 )
                 return
+            task.tool_calls.append(tool_call)
+            step.tool_calls.append(tool_call)
 
-            latest_graph_state = self._get_latest_graph_state(task_id=task.id)
             try:
                 result, updated_graph_state, last_error, retry_count, started_at, finished_at = (
                     self._run_tool_with_retry(
@@ -662,6 +932,9 @@ class TaskRunnerService:
                     )
                 )
             except PolicyViolationError as exc:
+                tool_call.status = ToolCallStatus.FAILED
+                tool_call.last_error = exc.message
+                tool_call.error_message = exc.message
                 self._fail_step_with_policy_violation(
                     task=task,
                     step=step,
@@ -672,6 +945,14 @@ class TaskRunnerService:
                 )
                 return
 
+            tool_call.status = ToolCallStatus.FAILED if result is None else ToolCallStatus.COMPLETED
+            tool_call.retry_count = retry_count
+            tool_call.last_error = last_error
+            tool_call.started_at = started_at
+            tool_call.finished_at = finished_at
+            tool_call.response_payload = result
+            tool_call.error_message = last_error
+
             if result is None:
                 step.status = TaskStepStatus.FAILED
                 step.error_message = last_error
@@ -683,33 +964,16 @@ class TaskRunnerService:
                     flow_name=task.flow_name,
                     current_node=task.current_node,
                     next_node=task.next_node,
-                    graph_state=latest_graph_state,
-                )
-                failed_tool_call = ToolCall(
-                    id=uuid4(),
-                    task_id=task.id,
-                    task_step_id=step.id,
-                    span_id=step.span_id,
-                    idempotency_key=idempotency_key,
-                    tool_name=tool_name,
-                    status=ToolCallStatus.FAILED,
-                    retry_count=retry_count,
-                    last_error=last_error,
-                    started_at=started_at,
-                    finished_at=finished_at,
-                    request_payload=request_payload,
-                    response_payload=None,
-                    error_message=last_error,
+                    completed_nodes=_completed_nodes(task.flow_name, latest_graph_state),
                 )
-                self.db.add(failed_tool_call)
                 logger.error(
                     "tool_call.failed",
                     extra={
-                        "task_id": str(task.id),
+                        "task_id": task_id_str,
                         "trace_id": task.trace_id,
-                        "step_id": str(step.id),
-                        "span_id": failed_tool_call.span_id,
-                        "tool_call_id": str(failed_tool_call.id),
+                        "step_id": step_id_str,
+                        "span_id": tool_call.span_id,
+                        "tool_call_id": str(tool_call.id),
                         "tool_name": tool_name,
                         "error": last_error,
                     },
@@ -725,60 +989,45 @@ class TaskRunnerService:
             task.status = TaskStatus.WAITING_OBSERVATION
             if updated_graph_state is None:
                 updated_graph_state = latest_graph_state
+            completed_nodes = _completed_nodes(task.flow_name, updated_graph_state)
             self._upsert_graph_snapshot(
                 task_id=task.id,
                 step_index=step.step_index,
                 current_node=task.current_node,
                 next_node=task.next_node,
                 graph_state=updated_graph_state,
+                completed_nodes=completed_nodes,
             )
             task.graph_state_summary = self._build_graph_state_summary(
                 flow_name=task.flow_name,
                 current_node=task.current_node,
                 next_node=task.next_node,
-                graph_state=updated_graph_state,
+                completed_nodes=completed_nodes,
             )
-            completed_tool_call = ToolCall(
-                id=uuid4(),
-                task_id=task.id,
-                task_step_id=step.id,
-                span_id=step.span_id,
-                idempotency_key=idempotency_key,
-                tool_name=tool_name,
-                status=ToolCallStatus.COMPLETED,
-                retry_count=retry_count,
-                last_error=None,
-                started_at=started_at,
-                finished_at=finished_at,
-                request_payload=request_payload,
-                response_payload=result,
-                error_message=None,
-            )
-            self.db.add(completed_tool_call)
             logger.info(
                 "tool_call.completed",
                 extra={
-                    "task_id": str(task.id),
+                    "task_id": task_id_str,
                     "trace_id": task.trace_id,
-                    "step_id": str(step.id),
-                    "span_id": completed_tool_call.span_id,
-                    "tool_call_id": str(completed_tool_call.id),
+                    "step_id": step_id_str,
+                    "span_id": tool_call.span_id,
+                    "tool_call_id": str(tool_call.id),
                     "tool_name": tool_name,
                     "retry_count": retry_count,
                 },
             )
 
-    def _get_latest_graph_state(self, task_id: UUID) -> dict[str, Any]:
+    def _get_latest_completed_nodes(self, task_id: UUID) -> list[str]:
         stmt = (
-            select(GraphStateSnapshot)
+            select(GraphStateSnapshot.completed_nodes)
             .where(GraphStateSnapshot.task_id == task_id)
             .order_by(GraphStateSnapshot.step_index.desc())
             .limit(1)
         )
-        snapshot = self.db.scalar(stmt)
-        if snapshot is None:
-            return {}
-        return snapshot.graph_state
+        completed_nodes = self.db.scalar(stmt)
+        if completed_nodes is None:
+            return []
+        return completed_nodes
 
     def _upsert_graph_snapshot(
         self,
@@ -788,29 +1037,26 @@ class TaskRunnerService:
         current_node: str | None,
         next_node: str | None,
         graph_state: dict[str, Any],
+        completed_nodes: list[str],
     ) -> None:
-        snapshot = self.db.scalar(
-            select(GraphStateSnapshot)
-            .where(
-                GraphStateSnapshot.task_id == task_id,
-                GraphStateSnapshot.step_index == step_index,
-            )
-            .limit(1)
+        stmt = pg_insert(GraphStateSnapshot).values(
+            task_id=task_id,
+            step_index=step_index,
+            current_node=current_node,
+            next_node=next_node,
+            graph_state=graph_state,
+            completed_nodes=completed_nodes,
         )
-        if snapshot is None:
-            self.db.add(
-                GraphStateSnapshot(
-                    task_id=task_id,
-                    step_index=step_index,
-                    current_node=current_node,
-                    next_node=next_node,
-                    graph_state=graph_state,
-                )
-            )
-            return
-        snapshot.current_node = current_node
-        snapshot.next_node = next_node
-        snapshot.graph_state = graph_state
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[GraphStateSnapshot.task_id, GraphStateSnapshot.step_index],
+            set_={
+                "current_node": stmt.excluded.current_node,
+                "next_node": stmt.excluded.next_node,
+                "graph_state": stmt.excluded.graph_state,
+                "completed_nodes": stmt.excluded.completed_nodes,
+            },
+        )
+        self.db.execute(stmt)
 
     def _build_graph_state_summary(
         self,
@@ -818,40 +1064,23 @@ class TaskRunnerService:
         flow_name: str,
         current_node: str | None,
         next_node: str | None,
-        graph_state: dict[str, Any],
+        completed_nodes: list[str],
     ) -> dict[str, Any]:
-        flow = get_flow_definition(flow_name)
-        state_field_by_node = {
-            "summarize": "summarize_result",
-            "classify": "classify_result",
-            "report": "report_result",
-        }
-        completed_nodes = [
-            node_name
-            for node_name in flow.node_sequence
-            if graph_state.get(state_field_by_node.get(node_name, node_name)) is not None
-        ]
+        total_nodes = len(get_flow_definition(flow_name).node_sequence)
         return {
             "flow": flow_name,
-            "total_nodes": len(flow.node_sequence),
+            "total_nodes": total_nodes,
             "completed_nodes": completed_nodes,
-            "remaining_nodes": len(flow.node_sequence) - len(completed_nodes),
+            "remaining_nodes": total_nodes - len(completed_nodes),
             "current_node": current_node,
             "next_node": next_node,
         }
 
     def _build_output_payload(self, task_id: UUID) -> dict[str, object]:
-        stmt = (
-            select(TaskStep)
-            .where(
-                TaskStep.task_id == task_id,
-                TaskStep.status == TaskStepStatus.COMPLETED,
-            )
-            .order_by(TaskStep.step_index.asc())
+        stmt = select(func.jsonb_object_agg(TaskStep.step_name, TaskStep.output_payload)).where(
+            TaskStep.task_id == task_id,
+            TaskStep.status == TaskStepStatus.COMPLETED,
+            # Also drops JSON null payloads, which decode to None like SQL NULL does.
+            func.jsonb_typeof(TaskStep.output_payload) != "null",
         )
-        steps = self.db.scalars(stmt).all()
-        return {
-            step.step_name: step.output_payload
-            for step in steps
-            if step.output_payload is not None
-        }
+        return self.db.scalar(stmt) or {}
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor
-from concurrent.futures import TimeoutError as FutureTimeoutError
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import partial
 from typing import Any
 
+import httpx
 from pydantic import BaseModel, ValidationError
 
 from taskrunner.policy import PolicyViolationError
@@ -23,7 +23,19 @@ class ToolSpec:
     name: str
     input_model: type[BaseModel]
     output_model: type[BaseModel]
-    executor: Callable[[Any], Any]
+    executor: Callable[[Any, float], Any]
+    _input_validator: Callable[[Any], BaseModel] = field(init=False, repr=False, compare=False)
+    _output_validator: Callable[[Any], BaseModel] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "_input_validator", self.input_model.__pydantic_validator__.validate_python
+        )
+        object.__setattr__(
+            self,
+            "_output_validator",
+            partial(self.output_model.__pydantic_validator__.validate_python, strict=True),
+        )
 
 
 _TOOL_REGISTRY: dict[str, ToolSpec] = {
@@ -63,41 +75,49 @@ def get_tool_spec(tool_name: str) -> ToolSpec:
         ) from exc
 
 
-def validate_tool_input(tool_name: str, payload: dict[str, Any]) -> BaseModel:
-    spec = get_tool_spec(tool_name)
+def validate_tool_input(tool: str | ToolSpec, payload: dict[str, Any]) -> BaseModel:
+    spec = tool if isinstance(tool, ToolSpec) else get_tool_spec(tool)
+    return _validate_input(spec, payload)
+
+
+def validate_tool_output(tool: str | ToolSpec, payload: Any) -> BaseModel:
+    spec = tool if isinstance(tool, ToolSpec) else get_tool_spec(tool)
+    return _validate_output(spec, payload)
+
+
+def _validate_input(spec: ToolSpec, payload: dict[str, Any]) -> BaseModel:
     try:
-        return spec.input_model.model_validate(payload)
+        return spec._input_validator(payload)
     except ValidationError as exc:
         raise PolicyViolationError(
             code="INVALID_TOOL_INPUT",
-            message=f"Tool '{tool_name}' input validation failed: {exc.errors()}",
+            message=f"Tool '{spec.name}' input validation failed: {exc.errors()}",
         ) from exc
 
 
-def validate_tool_output(tool_name: str, payload: Any) -> BaseModel:
-    spec = get_tool_spec(tool_name)
+def _validate_output(spec: ToolSpec, payload: Any) -> BaseModel:
+    if isinstance(payload, spec.output_model):
+        return payload
     candidate = payload.model_dump() if isinstance(payload, BaseModel) else payload
     try:
-        return spec.output_model.model_validate(candidate, strict=True)
+        return spec._output_validator(candidate)
     except ValidationError as exc:
         raise PolicyViolationError(
             code="INVALID_TOOL_OUTPUT",
-            message=f"Tool '{tool_name}' output validation failed: {exc.errors()}",
+            message=f"Tool '{spec.name}' output validation failed: {exc.errors()}",
         ) from exc
 
 
 def execute_tool(tool_name: str, payload: dict[str, Any], timeout_secs: float) -> dict[str, Any]:
     spec = get_tool_spec(tool_name)
-    validated_input = validate_tool_input(tool_name, payload)
-    with ThreadPoolExecutor(max_workers=1) as executor:
-        future = executor.submit(spec.executor, validated_input)
-        try:
-            output = future.result(timeout=timeout_secs)
-        except FutureTimeoutError as exc:
-            future.cancel()
-            raise PolicyViolationError(
-                code="TOOL_TIMEOUT",
-                message=f"Tool '{tool_name}' exceeded timeout of {timeout_secs:.2f}s",
-            ) from exc
-    validated_output = validate_tool_output(tool_name, output)
+    validated_input = _validate_input(spec, payload)
+    # Executors enforce the timeout on their own I/O, so no watchdog thread is needed.
+    try:
+        output = spec.executor(validated_input, timeout_secs)
+    except httpx.TimeoutException as exc:
+        raise PolicyViolationError(
+            code="TOOL_TIMEOUT",
+            message=f"Tool '{tool_name}' exceeded timeout of {timeout_secs:.2f}s",
+        ) from exc
+    validated_output = _validate_output(spec, output)
     return validated_output.model_dump()
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import time
+from typing import Any
+
 import httpx
 from pydantic import BaseModel, ConfigDict
 
@@ -19,21 +22,69 @@ class SocAgentOutput(BaseModel):
     reasoning_step: str
 
 
-def _call_cdrmind(path: str, payload: SocAgentInput) -> SocAgentOutput:
-    url = f"{get_cdrmind_url()}{path}"
-    response = httpx.post(url, json=payload.model_dump(), timeout=120.0)
-    response.raise_for_status()
-    data = response.json()
-    return SocAgentOutput(result=data.get("result", data), reasoning_step=data.get("reasoning_step", path))
+class _CdrmindResponse(BaseModel):
+    # Agents may answer with a bare result object, so unknown keys are kept.
+    model_config = ConfigDict(strict=False, extra="allow")
+    result: dict[str, Any] | None = None
+    reasoning_step: str | None = None
+
+
+_CDRMIND_CLIENTS: dict[str, httpx.Client] = {}
+
+
+def _get_cdrmind_client() -> httpx.Client:
+    base_url = get_cdrmind_url()
+    client = _CDRMIND_CLIENTS.get(base_url)
+    if client is None:
+        client = _CDRMIND_CLIENTS.setdefault(
+            base_url,
+            httpx.Client(
+                base_url=base_url,
+                limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=30.0),
+            ),
+        )
+    return client
+
+
+def close_cdrmind_clients() -> None:
+    while _CDRMIND_CLIENTS:
+        _, client = _CDRMIND_CLIENTS.popitem()
+        client.close()
+
+
+def _call_cdrmind(path: str, payload: SocAgentInput, timeout: float) -> SocAgentOutput:
+    # httpx timeouts bound each connect/read/write; the deadline bounds the whole call,
+    # so a server trickling bytes cannot hold the step past the policy timeout.
+    deadline = time.monotonic() + timeout
+    with _get_cdrmind_client().stream(
+        "POST",
+        path,
+        content=payload.model_dump_json(),
+        headers={"Content-Type": "application/json"},
+        timeout=timeout,
+    ) as response:
+        response.raise_for_status()
+        body = bytearray()
+        for chunk in response.iter_bytes():
+            if time.monotonic() > deadline:
+                raise httpx.ReadTimeout(
+                    f"{path} exceeded total timeout of {timeout:.2f}s", request=response.request
+                )
+            body += chunk
+    data = _CdrmindResponse.model_validate_json(body)
+    fields_set = data.model_fields_set
+    result = data.result if "result" in fields_set else data.model_dump(exclude_unset=True)
+    reasoning_step = data.reasoning_step if "reasoning_step" in fields_set else path
+    return SocAgentOutput.model_validate({"result": result, "reasoning_step": reasoning_step})
 
 
-def log_summarizer_call(payload: SocAgentInput) -> SocAgentOutput:
-    return _call_cdrmind("/agents/summarize", payload)
+def log_summarizer_call(payload: SocAgentInput, timeout: float) -> SocAgentOutput:
+    return _call_cdrmind("/agents/summarize", payload, timeout)
 
 
-def threat_classifier_call(payload: SocAgentInput) -> SocAgentOutput:
-    return _call_cdrmind("/agents/classify", payload)
+def threat_classifier_call(payload: SocAgentInput, timeout: float) -> SocAgentOutput:
+    return _call_cdrmind("/agents/classify", payload, timeout)
 
 
-def incident_reporter_call(payload: SocAgentInput) -> SocAgentOutput:
-    return _call_cdrmind("/agents/report", payload)
+def incident_reporter_call(payload: SocAgentInput, timeout: float) -> SocAgentOutput:
+    return _call_cdrmind("/agents/report", payload, timeout)
@@ -38,8 +38,8 @@ def get_tracer(name: str = "taskrunner") -> Any:
 
 
 def format_trace_id(trace_id: int) -> str:
-    return f"{trace_id:032x}" if trace_id else ""
+    return trace_id.to_bytes(16, "big").hex() if trace_id else ""
 
 
 def format_span_id(span_id: int) -> str:
-    return f"{span_id:016x}" if span_id else ""
+    return span_id.to_bytes(8, "big").hex() if span_id else ""
@@ -99,7 +99,9 @@ def test_list_tasks_returns_all_tasks(monkeypatch) -> None:
     first_task = _task(uuid4(), TaskStatus.COMPLETED)
     second_task = _task(uuid4(), TaskStatus.FAILED)
 
-    def fake_list_tasks(self: TaskRunnerService) -> list[Task]:
+    def fake_list_tasks(
+        self: TaskRunnerService, limit: int | None = None, offset: int = 0
+    ) -> list[Task]:
         return [first_task, second_task]
 
     monkeypatch.setattr(TaskRunnerService, "list_tasks", fake_list_tasks)
@@ -116,3 +118,47 @@ def test_list_tasks_returns_all_tasks(monkeypatch) -> None:
     assert len(payload) == 2
     assert payload[0]["id"] == str(first_task.id)
     assert payload[1]["id"] == str(second_task.id)
+
+
+def test_list_tasks_passes_limit_and_offset(monkeypatch) -> None:
+    task = _task(uuid4(), TaskStatus.COMPLETED)
+    calls: list[tuple[int | None, int]] = []
+
+    def fake_list_tasks(
+        self: TaskRunnerService, limit: int | None = None, offset: int = 0
+    ) -> list[Task]:
+        calls.append((limit, offset))
+        return [task]
+
+    monkeypatch.setattr(TaskRunnerService, "list_tasks", fake_list_tasks)
+    app.dependency_overrides[get_db] = lambda: object()
+
+    try:
+        client = TestClient(app)
+        response = client.get("/tasks", params={"limit": 1, "offset": 2})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert calls == [(1, 2)]
+    assert [item["id"] for item in response.json()] == [str(task.id)]
+
+
+def test_list_tasks_rejects_out_of_range_pagination(monkeypatch) -> None:
+    def fake_list_tasks(
+        self: TaskRunnerService, limit: int | None = None, offset: int = 0
+    ) -> list[Task]:
+        raise AssertionError("list_tasks should not be called")
+
+    monkeypatch.setattr(TaskRunnerService, "list_tasks", fake_list_tasks)
+    app.dependency_overrides[get_db] = lambda: object()
+
+    try:
+        client = TestClient(app)
+        zero_limit = client.get("/tasks", params={"limit": 0})
+        negative_offset = client.get("/tasks", params={"offset": -1})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert zero_limit.status_code == 422
+    assert negative_offset.status_code == 422
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import pytest
 
-from taskrunner.flows import get_flow_definition, list_flows
+from taskrunner.flows import get_flow_definition, get_step_input_builder, list_flows
 
 
 def test_registry_has_soc_pipeline() -> None:
@@ -26,3 +26,14 @@ def test_soc_pipeline_next_node() -> None:
 def test_get_unknown_flow_raises() -> None:
     with pytest.raises(ValueError, match="Unsupported flow"):
         get_flow_definition("echo_add")
+
+
+def test_soc_nodes_share_step_input_builder() -> None:
+    builder = get_step_input_builder("log_summarizer")
+    assert get_step_input_builder("threat_classifier") is builder
+    assert get_step_input_builder("incident_reporter") is builder
+
+
+def test_get_unknown_step_input_builder_raises() -> None:
+    with pytest.raises(ValueError, match="Unsupported node"):
+        get_step_input_builder("evil_tool")
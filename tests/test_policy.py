@@ -3,11 +3,13 @@ from __future__ import annotations
 from types import SimpleNamespace
 from uuid import uuid4
 
+import httpx
 import pytest
 
 from taskrunner.flows import FlowDefinition
 from taskrunner.policy import PolicyViolationError
 from taskrunner.service import TaskRunnerService
+from taskrunner.tool_registry import execute_tool
 
 
 class FakeDB:
@@ -91,3 +93,23 @@ def test_run_task_respects_policy_max_steps(monkeypatch: pytest.MonkeyPatch) ->
 
     assert exc_info.value.code == "MAX_STEPS_EXCEEDED"
     assert db.commits == 1
+
+
+def test_tool_timeout_reported_as_policy_violation(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen_timeouts: list[float] = []
+
+    def timed_out(path, payload, timeout):  # type: ignore[no-untyped-def]
+        seen_timeouts.append(timeout)
+        raise httpx.ReadTimeout("timed out")
+
+    monkeypatch.setattr("taskrunner.tools._call_cdrmind", timed_out)
+
+    with pytest.raises(PolicyViolationError) as exc_info:
+        execute_tool(
+            "log_summarizer",
+            {"raw_logs": ["log1"], "context": {}, "session_id": "s1"},
+            timeout_secs=0.5,
+        )
+
+    assert exc_info.value.code == "TOOL_TIMEOUT"
+    assert seen_timeouts == [0.5]
@@ -1,13 +1,31 @@
 from __future__ import annotations
 
-from datetime import datetime
+from collections.abc import Callable
+from contextlib import nullcontext
+from datetime import UTC, datetime
 from types import SimpleNamespace
-from uuid import uuid4
+from typing import Any
+from uuid import RFC_4122, UUID, uuid4
 
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
 
-from taskrunner.models import TaskStatus
-from taskrunner.service import MaxStepsExceededError, TaskRunnerService
+from taskrunner.flows import FlowDefinition
+from taskrunner.models import Base, Task, TaskStatus
+from taskrunner.service import (
+    TASK_LOCK_MAX_ATTEMPTS,
+    TOOL_WAIT_MIN_SECONDS,
+    UUID_POOL_SIZE,
+    MaxStepsExceededError,
+    TaskLockedError,
+    TaskRunnerService,
+    _completed_nodes,
+    _next_uuid,
+)
 
 
 def test_run_task_raises_after_max_steps(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -15,7 +33,7 @@ def test_run_task_raises_after_max_steps(monkeypatch: pytest.MonkeyPatch) -> Non
     task_id = uuid4()
     running = SimpleNamespace(status=TaskStatus.RUNNING)
 
-    monkeypatch.setattr(service, "get_task", lambda task_id_arg: running)
+    monkeypatch.setattr(service, "_get_task_lite", lambda task_id_arg: running)
     monkeypatch.setattr(service, "advance_task", lambda task_id_arg: running)
 
     with pytest.raises(MaxStepsExceededError):
@@ -36,7 +54,7 @@ def test_run_task_returns_when_terminal(monkeypatch: pytest.MonkeyPatch) -> None
         state["count"] += 1
         return completed if state["count"] == 1 else running
 
-    monkeypatch.setattr(service, "get_task", fake_get_task)
+    monkeypatch.setattr(service, "_get_task_lite", fake_get_task)
     monkeypatch.setattr(service, "advance_task", fake_advance_task)
 
     result = service.run_task(task_id, max_steps=2)
@@ -72,7 +90,13 @@ def test_run_tool_with_retry_returns_retry_count_after_transient_failure(
             raise RuntimeError("temporary failure")
         return {"ok": True, "tool": node_name, "flow": flow_name}, {**graph_state, "ok": True}
 
+    sleeps: list[float] = []
+    clock = iter([1_700_000_000.0, 1_700_000_002.5])
     monkeypatch.setattr("taskrunner.service.execute_graph_node", fake_execute_graph_node)
+    monkeypatch.setattr(
+        "taskrunner.service.time",
+        SimpleNamespace(time=lambda: next(clock), sleep=sleeps.append),
+    )
 
     result, graph_state, last_error, retry_count, started_at, finished_at = (
         service._run_tool_with_retry(
@@ -88,5 +112,280 @@ def test_run_tool_with_retry_returns_retry_count_after_transient_failure(
     assert graph_state == {"raw_logs": ["log1"], "session_id": "s1", "ok": True}
     assert last_error is None
     assert retry_count == 1
-    assert isinstance(started_at, datetime)
-    assert isinstance(finished_at, datetime)
+    assert sleeps == [TOOL_WAIT_MIN_SECONDS]
+    assert started_at == datetime(2023, 11, 14, 22, 13, 20, tzinfo=UTC)
+    assert finished_at == datetime(2023, 11, 14, 22, 13, 22, 500000, tzinfo=UTC)
+
+
+class _LockContendedDB:
+    def __init__(self) -> None:
+        self.lock_attempts = 0
+        self.rollbacks = 0
+
+    def execute(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+        # SKIP LOCKED returns no row while another worker holds the task.
+        self.lock_attempts += 1
+        return SimpleNamespace(unique=lambda: SimpleNamespace(scalar_one_or_none=lambda: None))
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+
+def test_get_task_for_update_raises_after_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    db = _LockContendedDB()
+    service = TaskRunnerService(db=db)  # type: ignore[arg-type]
+    delays: list[float] = []
+    monkeypatch.setattr("taskrunner.service.time", SimpleNamespace(sleep=delays.append))
+
+    with pytest.raises(TaskLockedError):
+        service._get_task_for_update(uuid4())
+
+    assert db.lock_attempts == TASK_LOCK_MAX_ATTEMPTS
+    assert len(delays) == TASK_LOCK_MAX_ATTEMPTS - 1
+    assert delays == sorted(delays)
+
+
+def test_advance_task_returns_current_task_when_locked(monkeypatch: pytest.MonkeyPatch) -> None:
+    db = _LockContendedDB()
+    service = TaskRunnerService(db=db)  # type: ignore[arg-type]
+    task_id = uuid4()
+    current = SimpleNamespace(status=TaskStatus.RUNNING)
+    running = SimpleNamespace(id=task_id, trace_id="trace", status=TaskStatus.RUNNING)
+
+    def locked(task_id_arg):
+        raise TaskLockedError("locked")
+
+    monkeypatch.setattr(
+        service,
+        "_get_task_progress",
+        lambda task_id_arg: SimpleNamespace(task=running),
+    )
+    monkeypatch.setattr(service, "_get_task_for_update", locked)
+    monkeypatch.setattr(service, "get_task", lambda task_id_arg: current)
+
+    assert service.advance_task(task_id) is current
+    assert db.rollbacks == 1
+
+
+class _RunFastDB:
+    def __init__(self, fail_commit: bool = False) -> None:
+        self.commits = 0
+        self.rollbacks = 0
+        self.fail_commit = fail_commit
+
+    def begin_nested(self) -> nullcontext[None]:
+        return nullcontext()
+
+    def commit(self) -> None:
+        self.commits += 1
+        if self.fail_commit:
+            raise RuntimeError("commit failed")
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+
+def _run_fast_service(
+    monkeypatch: pytest.MonkeyPatch, db: _RunFastDB, advance: Callable[[UUID], Any]
+) -> TaskRunnerService:
+    service = TaskRunnerService(db=db)  # type: ignore[arg-type]
+    monkeypatch.setattr(
+        service, "_get_task_lite", lambda task_id_arg: SimpleNamespace(status=TaskStatus.PLANNED)
+    )
+    monkeypatch.setattr(service, "_advance_task_in_transaction", advance)
+    return service
+
+
+def test_run_task_fast_commits_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    db = _RunFastDB()
+    statuses = iter([TaskStatus.RUNNING, TaskStatus.WAITING_OBSERVATION, TaskStatus.COMPLETED])
+    service = _run_fast_service(
+        monkeypatch, db, lambda task_id_arg: SimpleNamespace(status=next(statuses))
+    )
+
+    result = service.run_task_fast(uuid4(), max_steps=5)
+    assert result.status == TaskStatus.COMPLETED
+    assert db.commits == 1
+
+
+def test_run_task_fast_commits_progress_before_failing_step(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    db = _RunFastDB()
+    state = {"count": 0}
+
+    def fake_advance(task_id_arg):  # type: ignore[no-untyped-def]
+        state["count"] += 1
+        if state["count"] == 2:
+            raise RuntimeError("step failed")
+        return SimpleNamespace(status=TaskStatus.RUNNING)
+
+    service = _run_fast_service(monkeypatch, db, fake_advance)
+
+    with pytest.raises(RuntimeError, match="step failed"):
+        service.run_task_fast(uuid4(), max_steps=5)
+    assert db.commits == 1
+
+
+def test_run_task_fast_keeps_step_error_when_commit_fails(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    db = _RunFastDB(fail_commit=True)
+
+    def fake_advance(task_id_arg):  # type: ignore[no-untyped-def]
+        raise RuntimeError("step failed")
+
+    service = _run_fast_service(monkeypatch, db, fake_advance)
+
+    with pytest.raises(RuntimeError, match="step failed"):
+        service.run_task_fast(uuid4(), max_steps=5)
+    assert db.commits == 1
+    assert db.rollbacks == 1
+
+
+def test_run_task_fast_returns_current_task_when_locked(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    db = _RunFastDB()
+    current = SimpleNamespace(status=TaskStatus.RUNNING)
+    state = {"count": 0}
+
+    def fake_advance(task_id_arg):  # type: ignore[no-untyped-def]
+        state["count"] += 1
+        if state["count"] == 2:
+            raise TaskLockedError("locked")
+        return SimpleNamespace(status=TaskStatus.RUNNING)
+
+    service = _run_fast_service(monkeypatch, db, fake_advance)
+    monkeypatch.setattr(service, "get_task", lambda task_id_arg: current)
+
+    assert service.run_task_fast(uuid4(), max_steps=5) is current
+    assert state["count"] == 2
+    assert db.commits == 1
+
+
+def test_next_uuid_yields_unique_v4_ids_across_refills() -> None:
+    ids = [_next_uuid() for _ in range(UUID_POOL_SIZE * 2 + 1)]
+
+    assert len(set(ids)) == len(ids)
+    assert {uuid.version for uuid in ids} == {4}
+    assert {uuid.variant for uuid in ids} == {RFC_4122}
+
+
+def test_execute_step_reuses_recorded_call_without_running_tool(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    service = TaskRunnerService(db=object())  # type: ignore[arg-type]
+    recorded_call = SimpleNamespace(idempotency_key="task:step:log_summarizer")
+    step = SimpleNamespace(
+        id=uuid4(),
+        step_name="log_summarizer",
+        step_index=1,
+        span_id="span",
+        idempotency_key="task:step:log_summarizer",
+        input_payload={"raw_logs": ["log1"], "context": {}, "session_id": "s1"},
+        tool_calls=[recorded_call],
+        status=None,
+    )
+    task = SimpleNamespace(id=uuid4(), trace_id="trace", flow_name="soc_pipeline")
+    reused: list[object] = []
+
+    def should_not_run(**kwargs):  # type: ignore[no-untyped-def]
+        raise AssertionError("a recorded tool call must not be executed again")
+
+    monkeypatch.setattr(service, "_run_tool_with_retry", should_not_run)
+    monkeypatch.setattr(
+        service,
+        "_reuse_existing_tool_call",
+        lambda **kwargs: reused.append(kwargs["existing_call"]),
+    )
+
+    service._execute_step(task, step, {})  # type: ignore[arg-type]
+
+    assert reused == [recorded_call]
+
+
+def test_completed_nodes_follow_flow_result_fields() -> None:
+    graph_state = {
+        "raw_logs": ["log1"],
+        "log_summarizer_result": {"result": {}},
+        "threat_classifier_result": {"result": {}},
+    }
+
+    assert _completed_nodes("soc_pipeline", graph_state) == [
+        "log_summarizer",
+        "threat_classifier",
+    ]
+
+
+def test_completed_nodes_use_the_current_flow_definition(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    graph_state = {"log_summarizer_result": {}, "threat_classifier_result": {}}
+    assert _completed_nodes("soc_pipeline", graph_state) == [
+        "log_summarizer",
+        "threat_classifier",
+    ]
+
+    short_flow = FlowDefinition(
+        name="soc_pipeline",
+        node_sequence=("log_summarizer",),
+        node_handlers={},
+        graph=SimpleNamespace(),
+    )
+    monkeypatch.setattr("taskrunner.service.get_flow_definition", lambda _: short_flow)
+
+    assert _completed_nodes("soc_pipeline", graph_state) == ["log_summarizer"]
+
+
+def test_list_tasks_applies_limit_and_offset() -> None:
+    statements = []
+    db = SimpleNamespace(
+        scalars=lambda stmt: statements.append(stmt) or SimpleNamespace(all=lambda: [])
+    )
+    service = TaskRunnerService(db=db)  # type: ignore[arg-type]
+
+    assert service.list_tasks(limit=5, offset=10) == []
+    assert service.list_tasks() == []
+
+    paged, unpaged = (
+        str(stmt.compile(compile_kwargs={"literal_binds": True})) for stmt in statements
+    )
+    assert "LIMIT 5 OFFSET 10" in paged
+    assert "LIMIT" not in unpaged
+    assert "OFFSET" not in unpaged
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_for_sqlite(type_, compiler, **kwargs):  # type: ignore[no-untyped-def]
+    return "JSON"
+
+
+def test_get_task_raises_on_unloaded_relationship() -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    now = datetime.now(UTC)
+    task_id = uuid4()
+    with Session(engine) as session:
+        session.add(
+            Task(
+                id=task_id,
+                trace_id="trace",
+                status=TaskStatus.PLANNED,
+                flow_name="soc_pipeline",
+                current_step=0,
+                graph_state_summary={},
+                input_payload={},
+                created_at=now,
+                updated_at=now,
+            )
+        )
+        session.commit()
+
+    with Session(engine) as session:
+        task = TaskRunnerService(db=session).get_task(task_id)
+
+        assert task.steps == []
+        assert task.tool_calls == []
+        with pytest.raises(InvalidRequestError):
+            task.graph_state_snapshots  # noqa: B018
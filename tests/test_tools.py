@@ -1,6 +1,18 @@
 from __future__ import annotations
 
-from taskrunner.tools import SocAgentInput, SocAgentOutput
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from taskrunner.tools import (
+    _CDRMIND_CLIENTS,
+    SocAgentInput,
+    SocAgentOutput,
+    _call_cdrmind,
+    _get_cdrmind_client,
+    close_cdrmind_clients,
+)
 
 
 def test_soc_agent_input_model() -> None:
@@ -20,3 +32,60 @@ def test_soc_agent_output_model() -> None:
     )
     assert output.result["risk_score"] == 8.5
     assert output.reasoning_step == "log_summarizer"
+
+
+def test_cdrmind_client_reused_per_base_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CDRMIND_URL", "http://cdrmind-a:8000")
+    client = _get_cdrmind_client()
+    assert _get_cdrmind_client() is client
+
+    monkeypatch.setenv("CDRMIND_URL", "http://cdrmind-b:8000")
+    other = _get_cdrmind_client()
+    assert other is not client
+    assert str(other.base_url) == "http://cdrmind-b:8000"
+
+    close_cdrmind_clients()
+    assert client.is_closed
+    assert other.is_closed
+
+
+def _stub_cdrmind_client(monkeypatch: pytest.MonkeyPatch, body: bytes) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body)
+
+    monkeypatch.setenv("CDRMIND_URL", "http://cdrmind-stub:8000")
+    monkeypatch.setitem(
+        _CDRMIND_CLIENTS,
+        "http://cdrmind-stub:8000",
+        httpx.Client(base_url="http://cdrmind-stub:8000", transport=httpx.MockTransport(handler)),
+    )
+
+
+def test_call_cdrmind_parses_agent_response(monkeypatch: pytest.MonkeyPatch) -> None:
+    _stub_cdrmind_client(monkeypatch, b'{"result": {"risk_score": 8.5}}')
+    payload = SocAgentInput(raw_logs=["log1"], context={}, session_id="s1")
+
+    output = _call_cdrmind("/agents/summarize", payload, timeout=1.0)
+
+    assert output.result == {"risk_score": 8.5}
+    assert output.reasoning_step == "/agents/summarize"
+
+
+def test_call_cdrmind_enforces_total_deadline(monkeypatch: pytest.MonkeyPatch) -> None:
+    _stub_cdrmind_client(monkeypatch, b'{"result": {}}')
+    clock = iter([0.0, 2.0])
+    monkeypatch.setattr("taskrunner.tools.time", SimpleNamespace(monotonic=lambda: next(clock)))
+    payload = SocAgentInput(raw_logs=["log1"], context={}, session_id="s1")
+
+    with pytest.raises(httpx.TimeoutException):
+        _call_cdrmind("/agents/summarize", payload, timeout=1.0)
+
+
+def test_call_cdrmind_uses_bare_response_as_result(monkeypatch: pytest.MonkeyPatch) -> None:
+    _stub_cdrmind_client(monkeypatch, b'{"risk_score": 3, "reasoning_step": "classify"}')
+    payload = SocAgentInput(raw_logs=["log1"], context={}, session_id="s1")
+
+    output = _call_cdrmind("/agents/classify", payload, timeout=1.0)
+
+    assert output.result == {"risk_score": 3, "reasoning_step": "classify"}
+    assert output.reasoning_step == "classify"